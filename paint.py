@@ -1,13 +1,62 @@
 """
 Imports the Python libraries needed to the project.
 """
+import functools
 import sys
 from enum import Enum
 from PyQt5.QtWidgets import QWidget, QVBoxLayout, QMainWindow, QGridLayout, QAction, QGroupBox, QRadioButton, QSlider, \
     QLabel, QPushButton, QApplication, QFileDialog, QColorDialog, QMessageBox
-from PyQt5.QtGui import QIcon, QImage, QPen, QPainter, QColor
-from PyQt5.QtCore import Qt, QPoint, QSize
-from qtpy import QtCore, QtGui
+from PyQt5.QtGui import QIcon, QImage, QImageReader, QPixmap, QPen, QPainter, QColor
+from PyQt5.QtCore import Qt, QPoint, QRect, QSize, QCoreApplication, QBuffer, QByteArray, QIODevice
+
+"""
+Maps the text of the brush settings buttons to the matching Qt values.
+"""
+_JOINS = {"Round": Qt.RoundJoin, "Miter": Qt.MiterJoin, "Bevel": Qt.BevelJoin}
+_CAPS = {"Square": Qt.SquareCap, "Flat": Qt.FlatCap, "Round": Qt.RoundCap}
+_STYLES = {" Solid": Qt.SolidLine, " Dash": Qt.DashLine, " Dot": Qt.DotLine}
+
+"""
+White pixel of the 32 bits formats used by the canvas.
+Filling an image with it directly broadcasts the value, without going through a QColor.
+"""
+_WHITE_ARGB = 0xFFFFFFFF
+
+
+"""
+Texts displayed by the About and Help message boxes.
+"""
+_ABOUT_HTML = ("<p>This Qt Application is a basic paint program made with PyQt. "
+               "You can draw something by yourself and then save it as a file. "
+               "PNG and JPG files can also be opened and edited.</p>")
+_HELP_HTML = ("Help"
+              "<p>Welcome on QPaint.</p> "
+              "<p>On the left side of the screen you can see a toolbox on which you have different boxes. "
+              "Each of these boxes contains buttons or sliders which allow you to customize the brush you want to"
+              "draw with.</p>"
+              "<p>The right size of the screen is the drawing area, where you can draw.</p> "
+              "<p>The program also has different menus you can see at the top of the window. "
+              "<p>These menus allow you to open a file, save your image, clean it, or even exit the program.</p>"
+              "We hope you will enjoy your experience."
+              "If you encounter any difficulty or need any information "
+              "you can send an email to nicolas.guillon@epitech.eu.</p>")
+
+"""
+Returns the icon of the given path, each file being loaded only once.
+"""
+@functools.lru_cache(maxsize=None)
+def _icon(path):
+    return QIcon(path)
+
+
+"""
+Returns the image in a format optimized for painting, converting it only if needed.
+"""
+def _toPaintFormat(img):
+    if img.format() in (QImage.Format_ARGB32_Premultiplied, QImage.Format_RGB32):
+        return img
+    return img.convertToFormat(QImage.Format_ARGB32_Premultiplied)
+
 
 """
 Defines an enum which represents the drawing modes.
@@ -45,16 +94,24 @@ class DrawingArea(QWidget):
         super().__init__()
 
         """
-        Initializes two images which will be used later to resize or undo.
+        Initializes the snapshot of the image which will be used later to undo.
+        It is stored compressed so it doesn't cost as much memory as a full image.
         """
-        self.resizeSavedImage = QImage(0, 0, QImage.Format_RGB32)
-        self.savedImage = QImage(0, 0, QImage.Format_RGB32)
+        self.savedImage = QByteArray()
+        self._pendingImage = None
 
         """
-        Sets our default image with the right size filled in white.
+        Sets our default image filled in white.
+        It is allocated once with the size of the screen, so resizing the widget doesn't
+        need to allocate or scale it.
         """
-        self.image = QImage(self.width(), self.height(), QImage.Format_RGB32)
-        self.image.fill(Qt.white)
+        self.image = self.newCanvas()
+
+        """
+        Initializes the pixmap which caches the image in the native format of the screen.
+        This is what is displayed by the widget.
+        """
+        self._pixmap = QPixmap.fromImage(self.image)
 
         """
         Sets the draw default settings, such as the brush size, the color or the style.
@@ -67,6 +124,19 @@ class DrawingArea(QWidget):
         self.brushJoin = Qt.RoundJoin
         self.drawMode = DrawMode.Point
 
+        """
+        Initializes the pen from the draw settings and the painter used during a stroke.
+        The pen is never rebuilt, it is modified in place when one of the settings changes.
+        It allows the selection of brush colour, brush size, line type, cap type, join type.
+        """
+        self._pen = QPen()
+        self._pen.setColor(QColor(self.brushColor))
+        self._pen.setWidth(self.brushSize)
+        self._pen.setStyle(self.brushStyle)
+        self._pen.setCapStyle(self.brushCap)
+        self._pen.setJoinStyle(self.brushJoin)
+        self._painter = None
+
         """
         Initializes a point that we'll use later to draw lines.
         Sets a minimum width so the image width is never equal to 0. 
@@ -74,13 +144,20 @@ class DrawingArea(QWidget):
         self.lastPoint = QPoint()
         self.setMinimumWidth(150)
 
+        """
+        Initializes the area of the widget which needs to be repainted.
+        """
+        self._dirtyRect = QRect()
+
 
     """
     Method called when the widget is resized.
-    The image needs to be scaled with the new size or problems will occur.
+    The image is never scaled, the widget only displays its top left part.
+    It is only grown, keeping what has been drawn, if the widget gets larger than the screen.
     """
     def resizeEvent(self, event):
-        self.image = self.image.scaled(self.width(), self.height())
+        if event.size().width() > self.image.width() or event.size().height() > self.image.height():
+            self.setImage(self.image)
 
     """
     Method called when a button of the mouse is pressed.
@@ -92,9 +169,12 @@ class DrawingArea(QWidget):
             If the draw mode is set to Point we draw at the position of the mouse.
             """
             if self.drawMode == DrawMode.Point:
-                painter = QPainter(self.image)  # object which allows drawing to take place on an image
-                painter.setPen(QPen(self.brushColor, self.brushSize, self.brushStyle, self.brushCap, self.brushJoin))
-                painter.drawPoint(event.pos())
+                self.endStroke()
+                self.saveImage()
+                self._painter = QPainter(self.image)  # object which allows drawing to take place on an image
+                self._painter.setPen(self._pen)
+                self._painter.drawPoint(event.pos())
+                self.markDirty(event.pos(), event.pos())
                 self.drawing = True  # we are now entering draw mode
                 self.lastPoint = event.pos()  # new point is saved as last point
             elif self.drawMode == DrawMode.Line:
@@ -105,49 +185,176 @@ class DrawingArea(QWidget):
                 if self.lastPoint == QPoint():
                     self.lastPoint = event.pos()
                 else:
+                    self.saveImage()
                     painter = QPainter(self.image)  # object which allows drawing to take place on an image
-                    painter.setPen(QPen(self.brushColor, self.brushSize, self.brushStyle, self.brushCap, self.brushJoin))
+                    painter.setPen(self._pen)
                     painter.drawLine(self.lastPoint, event.pos())
+                    painter.end()
+                    self.storeSavedImage()
+                    self.markDirty(self.lastPoint, event.pos())
                     self.lastPoint = QPoint()
 
-            """
-            Tells the library to update the widget, as something might have been drawn.
-            """
-            self.update()
-
     """
     Method called when the mouse is moved.
     Here it is only used when the draw mode is set to Point and if the user
     keeps drawing while moving the mouse.
     """
     def mouseMoveEvent(self, event):
-        if (event.buttons() & Qt.LeftButton) & self.drawing & (self.drawMode == DrawMode.Point):
-            painter = QPainter(self.image)  # object which allows drawing to take place on an image
-            # allows the selection of brush colour, brush size, line type, cap type, join type
-            painter.setPen(QPen(self.brushColor, self.brushSize, self.brushStyle, self.brushCap, self.brushJoin))
-            painter.drawLine(self.lastPoint, event.pos())
-            self.lastPoint = event.pos()
-            self.update()
+        if self.drawing and self.drawMode == DrawMode.Point and event.buttons() & Qt.LeftButton:
+            pos = event.pos()
+            last = self.lastPoint
+            self._painter.drawLine(last, pos)  # the painter has been opened by the press
+            self.markDirty(last, pos)
+            self.lastPoint = pos
 
     """
     Method called when a button of the mouse is released.
     Here again we only are interested about the left click.
     """
     def mouseReleaseEvent(self, event):
-        if event.button == Qt.LeftButton:
-            """
-            Saves the image before the modification.
-            """
-            self.savedImage = self.resizeSavedImage
-            self.resizeSavedImage = self.image
+        if event.button() == Qt.LeftButton:
+            self.endStroke()
+
+    """
+    Returns the size of the canvas, large enough for both the screen and the widget.
+    """
+    def canvasSize(self):
+        return QApplication.primaryScreen().size().expandedTo(self.size())
+
+    """
+    Returns a new image filled in white with the size of the canvas.
+    """
+    def newCanvas(self):
+        canvas = QImage(self.canvasSize(), QImage.Format_ARGB32_Premultiplied)
+        canvas.fill(_WHITE_ARGB)
+        return canvas
+
+    """
+    Replaces the image and updates the widget.
+    If the new image doesn't have the size of the canvas it is drawn on the top left of a new one.
+    A stroke in progress is ended first, as its painter is bound to the replaced image.
+    """
+    def setImage(self, image):
+        self.endStroke()
+        if image.size() == self.canvasSize():
+            self.image = image
+        else:
+            canvas = self.newCanvas()
+            painter = QPainter(canvas)
+            painter.drawImage(0, 0, image)
+            painter.end()
+            self.image = canvas
+        self.refreshPixmap()
+        self.update()
+
+    """
+    Returns the part of the image which is displayed by the widget.
+    """
+    def visibleImage(self):
+        return self.image.copy(self.rect())
+
+    """
+    Saves the image before a modification so it can be undone.
+    The copy is shallow, the data is only duplicated once the image is painted on,
+    and it is compressed when the modification is over.
+    """
+    def saveImage(self):
+        self._pendingImage = QImage(self.image)
+
+    """
+    Compresses the image saved before the last modification, if any, into the undo snapshot.
+    """
+    def storeSavedImage(self):
+        if self._pendingImage is not None:
+            self.savedImage = self.snapshot(self._pendingImage)
+            self._pendingImage = None
+
+    """
+    Returns the image compressed in the PNG format.
+    """
+    def snapshot(self, img):
+        buf = QBuffer()
+        buf.open(QIODevice.WriteOnly)
+        img.save(buf, "PNG")
+        return buf.data()
+
+    """
+    Returns the image decompressed from a snapshot.
+    """
+    def restoreSnapshot(self, data):
+        img = QImage()
+        img.loadFromData(data, "PNG")
+        return _toPaintFormat(img)
+
+    """
+    Closes the painter opened at the beginning of a stroke, if any,
+    and stores the image saved before the stroke so it can be undone.
+    """
+    def endStroke(self):
+        if self._painter is not None:
+            self._painter.end()
+            self._painter = None
             self.drawing = False
+        self.storeSavedImage()
+
+    """
+    Methods which change the draw settings and update the pen in place.
+    """
+    def setBrushSize(self, size):
+        self.brushSize = size
+        self._pen.setWidth(size)
+
+    def setBrushColor(self, color):
+        self.brushColor = color
+        self._pen.setColor(color)
+
+    def setBrushStyle(self, style):
+        self.brushStyle = style
+        self._pen.setStyle(style)
+
+    def setBrushCap(self, cap):
+        self.brushCap = cap
+        self._pen.setCapStyle(cap)
+
+    def setBrushJoin(self, join):
+        self.brushJoin = join
+        self._pen.setJoinStyle(join)
+
+    """
+    Adds the segment between two points to the area which needs to be repainted
+    and tells the library to update only this part of the widget.
+    The rectangle is inflated by the brush size so the caps are not cut.
+    """
+    def markDirty(self, start, end):
+        margin = self.brushSize + 2
+        segmentRect = QRect(start, end).normalized().adjusted(-margin, -margin, margin, margin)
+        self._dirtyRect = self._dirtyRect.united(segmentRect)
+        self.refreshPixmap(segmentRect)
+        self.update(self._dirtyRect)
+
+    """
+    Copies the image to the pixmap which is displayed.
+    If a rectangle is given only this part is copied, else the whole pixmap is rebuilt
+    which has to be done every time the image is replaced.
+    """
+    def refreshPixmap(self, rect=None):
+        if rect is None:
+            self._pixmap = QPixmap.fromImage(self.image)
+        else:
+            pixmapPainter = QPainter(self._pixmap)
+            pixmapPainter.drawImage(rect.topLeft(), self.image, rect)
+            pixmapPainter.end()
 
     """
     Method called when a painting event occurs.
+    Only the part of the widget which needs it is repainted.
+    The pixmap has the size of the canvas, which is at least as large as the widget, and only its
+    top left part is displayed. It is drawn at its position without any scaling.
     """
     def paintEvent(self, event):
         canvasPainter = QPainter(self)
-        canvasPainter.drawImage(self.rect(), self.image, self.image.rect())
+        canvasPainter.drawPixmap(event.rect().topLeft(), self._pixmap, event.rect())
+        self._dirtyRect = QRect()
 
 
 """
@@ -162,7 +369,7 @@ class Window(QMainWindow):
         """
         self.setWindowTitle("QPaint")
         self.setGeometry(100, 100, 800, 600)  # top, left, width, height
-        self.setWindowIcon(QIcon("./icons/paint-brush.png"))
+        self.setWindowIcon(_icon("./icons/paint-brush.png"))
 
         """
         Initializes layouts and call the methods that will initialize 
@@ -171,11 +378,21 @@ class Window(QMainWindow):
         self.grid = QGridLayout()
         self.box = ToolBox()
         self.imageArea = DrawingArea()
+
+        """
+        Builds all the boxes of the toolbox before adding them in a single pass,
+        with the updates of the toolbox disabled meanwhile.
+        """
+        self.box.setUpdatesEnabled(False)
         self.setBrushSlider()
         self.setBrushStyle()
         self.setBrushCap()
         self.setBrushJoin()
         self.setColorChanger()
+        for groupBox in (self.groupBoxSlider, self.brush_line_type, self.brush_cap_type,
+                         self.brush_join_type, self.groupBoxColor):
+            self.box.vbox.addWidget(groupBox)
+        self.box.setUpdatesEnabled(True)
 
         """
         Creates a grid with the toolbox and the drawing area,
@@ -192,6 +409,7 @@ class Window(QMainWindow):
         """
         # menus
         mainMenu = self.menuBar()
+        mainMenu.setUpdatesEnabled(False)
         fileMenu = mainMenu.addMenu(" File")  # the space is required as "File" is reserved in Mac
         drawMenu = mainMenu.addMenu("Draw")
         helpMenu = mainMenu.addMenu("Help")
@@ -199,7 +417,7 @@ class Window(QMainWindow):
         """
         Creates the Save action and adds it to the "File" menu.
         """
-        saveAction = QAction(QIcon("./icons/save.png"), "Save", self)
+        saveAction = QAction(_icon("./icons/save.png"), "Save", self)
         saveAction.setShortcut("Ctrl+S")
         fileMenu.addAction(saveAction)
         """
@@ -210,7 +428,7 @@ class Window(QMainWindow):
         """
         Creates the Open action and adds it to the "File" menu.
         """
-        openAction = QAction(QIcon("./icons/open.png"), "Open", self)
+        openAction = QAction(_icon("./icons/open.png"), "Open", self)
         openAction.setShortcut("Ctrl+O")
         fileMenu.addAction(openAction)
         """
@@ -221,7 +439,7 @@ class Window(QMainWindow):
         """
         Creates the Undo action and adds it to the "File" menu.
         """
-        undoAction = QAction(QIcon("./icons/undo.png"), "Undo", self)
+        undoAction = QAction(_icon("./icons/undo.png"), "Undo", self)
         undoAction.setShortcut("Ctrl+Z")
         fileMenu.addAction(undoAction)
         """
@@ -232,7 +450,7 @@ class Window(QMainWindow):
         """
         Creates the Clear action and adds it to the "File" menu.
         """
-        clearAction = QAction(QIcon("./icons/clear.png"), "Clear", self)
+        clearAction = QAction(_icon("./icons/clear.png"), "Clear", self)
         clearAction.setShortcut("Ctrl+C")
         fileMenu.addAction(clearAction)
         """
@@ -243,7 +461,7 @@ class Window(QMainWindow):
         """
         Creates the Exit action and adds it to the "File" menu.
         """
-        exitAction = QAction(QIcon("./icons/exit.png"), "Exit", self)
+        exitAction = QAction(_icon("./icons/exit.png"), "Exit", self)
         exitAction.setShortcut("Ctrl+Q")
         fileMenu.addAction(exitAction)
         """
@@ -277,7 +495,7 @@ class Window(QMainWindow):
         """
         Creates the About action and adds it to the "Help" menu.
         """
-        aboutAction = QAction(QIcon("./icons/about.png"), "About", self)
+        aboutAction = QAction(_icon("./icons/about.png"), "About", self)
         aboutAction.setShortcut("Ctrl+I")
         helpMenu.addAction(aboutAction)
         """
@@ -288,19 +506,26 @@ class Window(QMainWindow):
         """
         Creates the Help action and adds it to the "Help" menu.
         """
-        helpAction = QAction(QIcon("./icons/help.png"), "Help", self)
+        helpAction = QAction(_icon("./icons/help.png"), "Help", self)
         helpAction.setShortcut("Ctrl+H")
         helpMenu.addAction(helpAction)
         """
         When the menu option is selected or the shortcut is used the help action is triggered.
         """
         helpAction.triggered.connect(self.help)
+        mainMenu.setUpdatesEnabled(True)
 
         """
         Updates the widget with the default settings.
         """
         self.imageArea.update()
 
+        """
+        The About and Help message boxes are built the first time they are displayed.
+        """
+        self._aboutBox = None
+        self._helpBox = None
+
     """
     Method which changes the draw mode depending on which action has been called.
     """
@@ -339,7 +564,7 @@ class Window(QMainWindow):
 
         """
         Sets a default value.
-        Adds the buttons to the layout which is added to the parent box.
+        Adds the buttons to the layout of the box.
         """
         self.joinBtn1.setChecked(True)
         qv = QVBoxLayout()
@@ -347,7 +572,6 @@ class Window(QMainWindow):
         qv.addWidget(self.joinBtn2)
         qv.addWidget(self.joinBtn3)
         self.brush_join_type.setLayout(qv)
-        self.box.vbox.addWidget(self.brush_join_type)
 
     """
     Initializes the layout on which we can change the Type setting of the brush.
@@ -362,23 +586,23 @@ class Window(QMainWindow):
         button is clicked.
         """
         self.styleBtn1 = QRadioButton(" Solid")
-        self.styleBtn1.setIcon(QIcon("./icons/solid.png"))
+        self.styleBtn1.setIcon(_icon("./icons/solid.png"))
         self.styleBtn1.setIconSize(QSize(32, 64))
         self.styleBtn1.clicked.connect(lambda: self.changeBrushStyle(self.styleBtn1))
 
         self.styleBtn2 = QRadioButton(" Dash")
-        self.styleBtn2.setIcon(QIcon("./icons/dash.png"))
+        self.styleBtn2.setIcon(_icon("./icons/dash.png"))
         self.styleBtn2.setIconSize(QSize(32, 64))
         self.styleBtn2.clicked.connect(lambda: self.changeBrushStyle(self.styleBtn2))
 
         self.styleBtn3 = QRadioButton(" Dot")
-        self.styleBtn3.setIcon(QIcon("./icons/dot.png"))
+        self.styleBtn3.setIcon(_icon("./icons/dot.png"))
         self.styleBtn3.setIconSize(QSize(32, 64))
         self.styleBtn3.clicked.connect(lambda: self.changeBrushStyle(self.styleBtn3))
 
         """
         Sets a default value.
-        Adds the buttons to the layout which is added to the parent box.
+        Adds the buttons to the layout of the box.
         """
         self.styleBtn1.setChecked(True)
         qv = QVBoxLayout()
@@ -386,7 +610,6 @@ class Window(QMainWindow):
         qv.addWidget(self.styleBtn2)
         qv.addWidget(self.styleBtn3)
         self.brush_line_type.setLayout(qv)
-        self.box.vbox.addWidget(self.brush_line_type)
 
     """
     Initializes the layout on which we can change the Cap setting of the brush.
@@ -409,7 +632,7 @@ class Window(QMainWindow):
 
         """
         Sets a default value.
-        Adds the buttons to the layout which is added to the parent box.
+        Adds the buttons to the layout of the box.
         """
         self.capBtn3.setChecked(True)
         qv = QVBoxLayout()
@@ -417,52 +640,30 @@ class Window(QMainWindow):
         qv.addWidget(self.capBtn2)
         qv.addWidget(self.capBtn3)
         self.brush_cap_type.setLayout(qv)
-        self.box.vbox.addWidget(self.brush_cap_type)
 
     """
     Method which changes the Join setting of the brush depending
     on which button has been previously clicked.
     """
     def changeBrushJoin(self, btn):
-        if btn.text() == "Round":
-            if btn.isChecked():
-                self.imageArea.brushJoin = Qt.RoundJoin
-        if btn.text() == "Miter":
-            if btn.isChecked():
-                self.imageArea.brushJoin = Qt.MiterJoin
-        if btn.text() == "Bevel":
-            if btn.isChecked():
-                self.imageArea.brushJoin = Qt.BevelJoin
+        if btn.isChecked():
+            self.imageArea.setBrushJoin(_JOINS[btn.text()])
 
     """
     Method which changes the Cap setting of the brush depending
     on which button has been previously clicked.
     """
     def changeBrushCap(self, btn):
-        if btn.text() == "Square":
-            if btn.isChecked():
-                self.imageArea.brushCap = Qt.SquareCap
-        if btn.text() == "Flat":
-            if btn.isChecked():
-                self.imageArea.brushCap = Qt.FlatCap
-        if btn.text() == "Round":
-            if btn.isChecked():
-                self.imageArea.brushCap = Qt.RoundCap
+        if btn.isChecked():
+            self.imageArea.setBrushCap(_CAPS[btn.text()])
 
     """
     Method which changes the Type setting of the brush depending
     on which button has been previously clicked.
     """
     def changeBrushStyle(self, btn):
-        if btn.text() == " Solid":
-            if btn.isChecked():
-                self.imageArea.brushStyle = Qt.SolidLine
-        if btn.text() == " Dash":
-            if btn.isChecked():
-                self.imageArea.brushStyle = Qt.DashLine
-        if btn.text() == " Dot":
-            if btn.isChecked():
-                self.imageArea.brushStyle = Qt.DotLine
+        if btn.isChecked():
+            self.imageArea.setBrushStyle(_STYLES[btn.text()])
 
     """
     Initializes the layout on which we can change the brush size.
@@ -481,27 +682,27 @@ class Window(QMainWindow):
 
         """
         Sets a label to display the size of the brush.
+        The texts of the label are computed once for every value of the slider.
         """
+        self._sizeLabels = ["%s px" % i for i in range(self.brush_thickness.maximum() + 1)]
         self.brushSizeLabel = QLabel()
-        self.brushSizeLabel.setText("%s px" % self.imageArea.brushSize)
+        self.brushSizeLabel.setText(self._sizeLabels[self.imageArea.brushSize])
 
         """
-        Adds the buttons to the layout which is added to the parent box.
+        Adds the buttons to the layout of the box.
         """
         qv = QVBoxLayout()
         qv.addWidget(self.brush_thickness)
         qv.addWidget(self.brushSizeLabel)
         self.groupBoxSlider.setLayout(qv)
 
-        self.box.vbox.addWidget(self.groupBoxSlider)
-
     """
     Method which changes the brush size depending on the value 
     sent from the slider. 
     """
     def sizeSliderChange(self, value):
-        self.imageArea.brushSize = value
-        self.brushSizeLabel.setText("%s px" % value)
+        self.imageArea.setBrushSize(value)
+        self.brushSizeLabel.setText(self._sizeLabels[value])
 
     """
     Initializes the layout on which we can change the color of the brush.
@@ -518,17 +719,14 @@ class Window(QMainWindow):
         self.brush_colour.setFixedSize(60, 60)
         self.brush_colour.clicked.connect(self.showColorDialog)
         self.brush_colour.setStyleSheet("background-color: %s" % self.col.name())
-        self.box.vbox.addWidget(self.brush_colour)
 
         """
-        Adds the buttons to the layout which is added to the parent box.
+        Adds the buttons to the layout of the box.
         """
         qv = QVBoxLayout()
         qv.addWidget(self.brush_colour)
         self.groupBoxColor.setLayout(qv)
 
-        self.box.vbox.addWidget(self.groupBoxColor)
-
     """
     Method which displays a color picker and sets the brush color.
     """
@@ -536,16 +734,7 @@ class Window(QMainWindow):
         self.col = QColorDialog.getColor()
         if self.col.isValid():
             self.brush_colour.setStyleSheet("background-color: %s" % self.col.name())
-            self.imageArea.brushColor = self.col
-
-    """
-    Method called when the main window is resized.
-    Scales the image area with the new size.
-    """
-    def resizeEvent(self, a0: QtGui.QResizeEvent):
-        if self.imageArea.resizeSavedImage.width() != 0:
-            self.imageArea.image = self.imageArea.resizeSavedImage.scaled(self.imageArea.width(), self.imageArea.height(), QtCore.Qt.IgnoreAspectRatio)
-        self.imageArea.update()
+            self.imageArea.setBrushColor(self.col)
 
     """
     Method called when we execute the save action.
@@ -556,7 +745,7 @@ class Window(QMainWindow):
         filePath, _ = QFileDialog.getSaveFileName(self, "Save Image", "", "PNG(*.png);;JPG(*.jpg *.jpeg);;All Files (*.*)")
         if filePath == "":
             return
-        self.imageArea.image.save(filePath)
+        self.imageArea.visibleImage().save(filePath)
 
     """
     Method called when we execute the open action.
@@ -567,17 +756,21 @@ class Window(QMainWindow):
         filePath, _ = QFileDialog.getOpenFileName(self, "Open Image", "", "PNG(*.png);;JPG(*.jpg *.jpeg);;All Files (*.*)")
         if filePath == "":
             return
-        with open(filePath, 'rb') as f:
-            content = f.read()
 
         """
-        Loads the data from the file to the image.
-        Scales it and updates the drawing area.
+        Loads the file directly into a new image, the current one is kept if the file can't be read.
+        The image is only converted if it isn't already in a format optimized for painting.
+        Scales it to the drawing area and updates it.
         """
-        self.imageArea.image.loadFromData(content)
-        self.imageArea.image = self.imageArea.image.scaled(self.imageArea.width(), self.imageArea.height(), QtCore.Qt.IgnoreAspectRatio)
-        self.imageArea.resizeSavedImage = self.imageArea.image  # saves the image for later resizing
-        self.imageArea.update()
+        reader = QImageReader(filePath)
+        reader.setAutoTransform(True)
+        image = reader.read()
+        if image.isNull():
+            return
+        image = _toPaintFormat(image)
+        if image.size() != self.imageArea.size():
+            image = image.scaled(self.imageArea.width(), self.imageArea.height(), Qt.IgnoreAspectRatio, Qt.FastTransformation)
+        self.imageArea.setImage(image)
 
     """
     Method called when we execute the undo action.
@@ -585,30 +778,31 @@ class Window(QMainWindow):
     before the last modification he made.
     """
     def undo(self):
-        copyImage = self.imageArea.image
-        if self.imageArea.savedImage.width() != 0:
+        self.imageArea.endStroke()  # the stroke painter would keep drawing on the replaced image
+        copyImage = self.imageArea.snapshot(self.imageArea.image)
+        if not self.imageArea.savedImage.isEmpty():
             """
-            If the saved image exists, we set the actual image to the saved one scaled to the right size.
+            If the saved image exists, we set the actual image to the saved one.
+            It already has the size of the canvas, unless the canvas has been grown since.
             """
-            self.imageArea.image = self.imageArea.savedImage.scaled(self.imageArea.width(), self.imageArea.height(), QtCore.Qt.IgnoreAspectRatio)
+            self.imageArea.setImage(self.imageArea.restoreSnapshot(self.imageArea.savedImage))
         else:
             """
             If no saved image exist we just clean the current one.
             """
-            self.imageArea.image = QImage(self.imageArea.width(), self.imageArea.height(), QImage.Format_RGB32)
-            self.imageArea.image.fill(Qt.white)
+            self.imageArea.setImage(self.imageArea.newCanvas())
         """
         Sets the saved image as the copy from the screen.
         """
         self.imageArea.savedImage = copyImage
-        self.imageArea.update()
 
     """
     Method called when we execute the clear action.
     It fills the image in white and updates it.
     """
     def clear(self):
-        self.imageArea.image.fill(Qt.white)
+        self.imageArea.image.fill(_WHITE_ARGB)
+        self.imageArea.refreshPixmap()
         self.imageArea.update()
 
     """
@@ -616,38 +810,33 @@ class Window(QMainWindow):
     Exits the program.
     """
     def exitProgram(self):
-        QtCore.QCoreApplication.quit()
+        QCoreApplication.quit()
 
     """
     Method called when we execute the about action.
     Displays a message about the program.
+    The message box is only built the first time.
     """
     def about(self):
-        QMessageBox.about(self, "About QPaint",
-                          "<p>This Qt Application is a basic paint program made with PyQt. "
-                          "You can draw something by yourself and then save it as a file. "
-                          "PNG and JPG files can also be opened and edited.</p>")
+        if self._aboutBox is None:
+            self._aboutBox = QMessageBox(self)
+            self._aboutBox.setWindowTitle("About QPaint")
+            self._aboutBox.setIconPixmap(self.windowIcon().pixmap(64, 64))
+            self._aboutBox.setText(_ABOUT_HTML)
+        self._aboutBox.exec_()
 
     """
     Method called when we execute the help action.
     Displays a help message about the program.
+    The message box is only built the first time.
     """
     def help(self):
-        msg = QMessageBox()
-        msg.setText("Help"
-                    "<p>Welcome on QPaint.</p> "
-                    "<p>On the left side of the screen you can see a toolbox on which you have different boxes. "
-                    "Each of these boxes contains buttons or sliders which allow you to customize the brush you want to"
-                    "draw with.</p>"
-                    "<p>The right size of the screen is the drawing area, where you can draw.</p> "
-                    "<p>The program also has different menus you can see at the top of the window. "
-                    "<p>These menus allow you to open a file, save your image, clean it, or even exit the program.</p>"
-                    "We hope you will enjoy your experience."
-                    "If you encounter any difficulty or need any information "
-                    "you can send an email to nicolas.guillon@epitech.eu.</p>")
-        msg.setWindowTitle("Help")
-        msg.move(self.width() / 2, self.height() / 2)
-        msg.exec_()
+        if self._helpBox is None:
+            self._helpBox = QMessageBox(self)
+            self._helpBox.setText(_HELP_HTML)
+            self._helpBox.setWindowTitle("Help")
+        self._helpBox.move(self.width() // 2, self.height() // 2)
+        self._helpBox.exec_()
 
 
 if __name__ == "__main__":